@@ -5,18 +5,17 @@ the ``sub`` claim set to the user's bare JID.
 """
 
 import os
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Annotated
 
 import jwt
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+import orjson
+from fastapi import HTTPException, Request, status
 
-_bearer_scheme = HTTPBearer()
-
-
-def _get_secret() -> str:
-    return os.environ["JWT_SECRET"]
+# Resolved once at import; the secret is fixed for the life of the process.
+_SECRET: bytes = os.environ["JWT_SECRET"].encode()
+_ALGORITHMS = ["HS256"]
+_jws = jwt.PyJWS(algorithms=_ALGORITHMS)
 
 
 def create_token(jid: str) -> str:
@@ -30,37 +29,79 @@ def create_token(jid: str) -> str:
         "iat": now,
         "exp": now + timedelta(hours=24),
     }
-    return jwt.encode(payload, _get_secret(), algorithm="HS256")
+    return jwt.encode(payload, _SECRET, algorithm="HS256")
+
+
+def _is_numeric_date(value: object) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
 
+async def verify_token(request: Request) -> str:
+    """Decode and validate the JWT from the ``Authorization: Bearer`` header.
 
-def verify_token(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(_bearer_scheme)],
-) -> str:
-    """Decode and validate a JWT bearer token.
+    The header is parsed directly instead of through ``HTTPBearer``, and
+    the token goes through PyJWS rather than PyJWT's full claim validation.
+    The claims ``jwt.decode`` would enforce are checked here instead: a
+    required ``exp`` in the future, ``nbf`` and ``iat`` not in the future,
+    no ``aud`` (this API never issues one), and a string ``sub``.
 
     Returns the bare JID from the ``sub`` claim.
     Raises 401 on any validation failure.
     """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
     try:
-        payload = jwt.decode(
-            credentials.credentials,
-            _get_secret(),
-            algorithms=["HS256"],
+        decoded = _jws.decode_complete(token, _SECRET, algorithms=_ALGORITHMS)
+        payload = orjson.loads(decoded["payload"])
+    except (jwt.InvalidTokenError, orjson.JSONDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
         )
-        jid: str | None = payload.get("sub")
-        if jid is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token missing sub claim",
-            )
-        return jid
-    except jwt.ExpiredSignatureError:
+
+    if not isinstance(payload, dict):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token has expired",
+            detail="Invalid token",
         )
-    except jwt.InvalidTokenError:
+
+    exp = payload.get("exp")
+    if not _is_numeric_date(exp) or "aud" in payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
         )
+    now = time.time()
+    if exp <= now:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has expired",
+        )
+    for claim in ("nbf", "iat"):
+        if claim not in payload:
+            continue
+        value = payload[claim]
+        if not _is_numeric_date(value):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token",
+            )
+        if value > now:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token is not yet valid",
+            )
+
+    jid = payload.get("sub")
+    if not isinstance(jid, str):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token missing sub claim",
+        )
+    return jid
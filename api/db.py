@@ -8,7 +8,12 @@ _pool: asyncpg.Pool | None = None
 
 
 async def get_pool() -> asyncpg.Pool:
-    """Return the shared connection pool, creating it on first call."""
+    """Return the shared connection pool, creating it on first call.
+
+    asyncpg prepares each distinct query once per connection and keeps it
+    in the statement cache, so handlers should pass constant SQL text to
+    ``pool.execute``/``pool.fetch`` rather than building it per request.
+    """
     global _pool
     if _pool is None:
         _pool = await asyncpg.create_pool(
@@ -0,0 +1,33 @@
+"""Shared HTTP client for the Ejabberd admin API."""
+
+import os
+
+import httpx
+
+EJABBERD_API_URL = os.environ.get("EJABBERD_API_URL", "http://ejabberd:5281/api")
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared admin API client, creating it on first call.
+
+    Reusing one client keeps connections to Ejabberd alive across requests
+    instead of paying a new TCP handshake per call. The admin API is
+    reached over plain HTTP on the internal Docker network.
+    """
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=EJABBERD_API_URL,
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
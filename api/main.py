@@ -4,16 +4,27 @@ from contextlib import asynccontextmanager
 from typing import AsyncIterator
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
 from db import close_pool, get_pool
+from ejabberd import close_client, get_client
 from routes import account, groups, push, server_info, turn
+from services import apns as apns_service
+from services import fcm as fcm_service
 
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
-    """Manage the database connection pool lifecycle."""
+    """Manage the database pool, Ejabberd client, and push provider lifecycle."""
     await get_pool()
+    get_client()
+    # Set up the push providers up front so the first call after a restart
+    # does not pay for loading credentials.
+    apns_service.get_client()
+    await fcm_service.warm_up()
     yield
+    apns_service.close_client()
+    await close_client()
     await close_pool()
 
 
@@ -21,6 +32,7 @@ app = FastAPI(
     title="Veil Backend API",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.include_router(push.router)
@@ -1,7 +1,16 @@
 """Pydantic models for request/response validation."""
 
+from typing import Annotated
+
 from pydantic import BaseModel, Field
 
+# Shared by registration and login. pydantic-core compiles the pattern once
+# into a linear-time Rust regex, which is faster than any Python-level check.
+Username = Annotated[
+    str,
+    Field(min_length=3, max_length=32, pattern=r"^[a-zA-Z0-9_]+$", examples=["alice"]),
+]
+
 
 # ---------- Push registration (INTERFACES.md §4.1 / §4.2) ----------
 
@@ -49,11 +58,7 @@ class ServerInfoResponse(BaseModel):
 # ---------- Account registration ----------
 
 class AccountRegisterRequest(BaseModel):
-    username: str = Field(
-        ..., min_length=3, max_length=32,
-        pattern=r"^[a-zA-Z0-9_]+$",
-        examples=["alice"],
-    )
+    username: Username
     password: str = Field(..., min_length=8, max_length=128)
 
 
@@ -64,11 +69,7 @@ class AccountRegisterResponse(BaseModel):
 
 
 class AccountLoginRequest(BaseModel):
-    username: str = Field(
-        ..., min_length=3, max_length=32,
-        pattern=r"^[a-zA-Z0-9_]+$",
-        examples=["alice"],
-    )
+    username: Username
     password: str = Field(..., min_length=8, max_length=128)
 
 
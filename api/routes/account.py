@@ -7,9 +7,11 @@ from typing import Annotated
 
 import httpx
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 
 from auth import create_token, verify_token
 from db import get_pool
+from ejabberd import get_client
 from models import (
     AccountDeleteRequest,
     AccountLoginRequest,
@@ -22,12 +24,39 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/account", tags=["account"])
 
-_EJABBERD_API_URL = os.environ.get("EJABBERD_API_URL", "https://ejabberd:5443/api")
 _XMPP_DOMAIN = os.environ.get("XMPP_DOMAIN", "example.com")
+_XMPP_DOMAIN_BYTES = _XMPP_DOMAIN.encode()
+_JID_SUFFIX = f"@{_XMPP_DOMAIN}"
 
+# Shared by register and login so both hit the same cached prepared statement.
+_UPSERT_SUBSCRIBER_SQL = """
+    INSERT INTO subscriber (username, domain, password, ha1, ha1b)
+    VALUES ($1, $2, '', $3, $4)
+    ON CONFLICT (username, domain) DO UPDATE
+    SET ha1 = EXCLUDED.ha1, ha1b = EXCLUDED.ha1b
+"""
 
-@router.post("/register", status_code=status.HTTP_201_CREATED, response_model=AccountRegisterResponse)
-async def register_account(body: AccountRegisterRequest) -> AccountRegisterResponse:
+
+def _sip_digests(username: str, password: str) -> tuple[str, str]:
+    """Compute the Kamailio subscriber ``ha1`` and ``ha1b`` digests.
+
+    ha1 = MD5(username:domain:password), ha1b = MD5(username@domain:domain:password)
+    """
+    user = username.encode()
+    secret = password.encode()
+    ha1 = hashlib.md5(b"%s:%s:%s" % (user, _XMPP_DOMAIN_BYTES, secret)).hexdigest()
+    ha1b = hashlib.md5(
+        b"%s@%s:%s:%s" % (user, _XMPP_DOMAIN_BYTES, _XMPP_DOMAIN_BYTES, secret)
+    ).hexdigest()
+    return ha1, ha1b
+
+
+@router.post(
+    "/register",
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_201_CREATED: {"model": AccountRegisterResponse}},
+)
+async def register_account(body: AccountRegisterRequest) -> ORJSONResponse:
     """Create a new user account.
 
     Registers the user with Ejabberd (XMPP) and inserts a Kamailio
@@ -38,12 +67,10 @@ async def register_account(body: AccountRegisterRequest) -> AccountRegisterRespo
 
     # Register with Ejabberd via admin API
     try:
-        async with httpx.AsyncClient(verify=False) as client:
-            resp = await client.post(
-                f"{_EJABBERD_API_URL}/register",
-                json={"user": username, "host": domain, "password": body.password},
-                timeout=10.0,
-            )
+        resp = await get_client().post(
+            "/register",
+            json={"user": username, "host": domain, "password": body.password},
+        )
     except httpx.HTTPError:
         logger.exception("Failed to reach Ejabberd admin API")
         raise HTTPException(
@@ -51,7 +78,11 @@ async def register_account(body: AccountRegisterRequest) -> AccountRegisterRespo
             detail="Registration service unavailable. Please try again later.",
         )
 
-    if resp.status_code == 409 or (resp.status_code == 200 and resp.text and "already registered" in resp.text.lower()):
+    # Ejabberd reports duplicates with 409; some versions answer 200 with an
+    # "already registered" message instead, so check the raw bytes for that.
+    if resp.status_code == 409 or (
+        resp.status_code == 200 and b"already registered" in resp.content.lower()
+    ):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="That username is already taken.",
@@ -65,39 +96,32 @@ async def register_account(body: AccountRegisterRequest) -> AccountRegisterRespo
         )
 
     # Insert Kamailio subscriber row for SIP digest authentication
-    ha1 = hashlib.md5(f"{username}:{domain}:{body.password}".encode()).hexdigest()
-    ha1b = hashlib.md5(f"{username}@{domain}:{domain}:{body.password}".encode()).hexdigest()
+    ha1, ha1b = _sip_digests(username, body.password)
     pool = await get_pool()
     try:
-        async with pool.acquire() as conn:
-            await conn.execute(
-                """INSERT INTO subscriber (username, domain, password, ha1, ha1b)
-                   VALUES ($1, $2, '', $3, $4)
-                   ON CONFLICT (username, domain) DO UPDATE
-                   SET ha1 = EXCLUDED.ha1, ha1b = EXCLUDED.ha1b""",
-                username, domain, ha1, ha1b,
-            )
+        await pool.execute(_UPSERT_SUBSCRIBER_SQL, username, domain, ha1, ha1b)
     except Exception:
         logger.exception("Failed to insert Kamailio subscriber for %s", username)
 
-    jid = f"{username}@{domain}"
+    jid = username + _JID_SUFFIX
     token = create_token(jid)
-    return AccountRegisterResponse(jid=jid, token=token)
+    return ORJSONResponse(
+        AccountRegisterResponse(jid=jid, token=token).model_dump(),
+        status_code=status.HTTP_201_CREATED,
+    )
 
 
-@router.post("/login", response_model=AccountLoginResponse)
-async def login_account(body: AccountLoginRequest) -> AccountLoginResponse:
+@router.post("/login", responses={status.HTTP_200_OK: {"model": AccountLoginResponse}})
+async def login_account(body: AccountLoginRequest) -> ORJSONResponse:
     """Authenticate an existing user and issue a JWT."""
     username = body.username.lower()
     domain = _XMPP_DOMAIN
 
     try:
-        async with httpx.AsyncClient(verify=False) as client:
-            resp = await client.post(
-                f"{_EJABBERD_API_URL}/check_password",
-                json={"user": username, "host": domain, "password": body.password},
-                timeout=10.0,
-            )
+        resp = await get_client().post(
+            "/check_password",
+            json={"user": username, "host": domain, "password": body.password},
+        )
     except httpx.HTTPError:
         logger.exception("Failed to reach Ejabberd admin API for login")
         raise HTTPException(
@@ -113,31 +137,23 @@ async def login_account(body: AccountLoginRequest) -> AccountLoginResponse:
         )
 
     # Ensure Kamailio subscriber row exists (upsert for existing users)
-    ha1 = hashlib.md5(f"{username}:{domain}:{body.password}".encode()).hexdigest()
-    ha1b = hashlib.md5(f"{username}@{domain}:{domain}:{body.password}".encode()).hexdigest()
+    ha1, ha1b = _sip_digests(username, body.password)
     pool = await get_pool()
     try:
-        async with pool.acquire() as conn:
-            await conn.execute(
-                """INSERT INTO subscriber (username, domain, password, ha1, ha1b)
-                   VALUES ($1, $2, '', $3, $4)
-                   ON CONFLICT (username, domain) DO UPDATE
-                   SET ha1 = EXCLUDED.ha1, ha1b = EXCLUDED.ha1b""",
-                username, domain, ha1, ha1b,
-            )
+        await pool.execute(_UPSERT_SUBSCRIBER_SQL, username, domain, ha1, ha1b)
     except Exception:
         logger.exception("Failed to upsert Kamailio subscriber for %s", username)
 
-    jid = f"{username}@{domain}"
+    jid = username + _JID_SUFFIX
     token = create_token(jid)
-    return AccountLoginResponse(jid=jid, token=token)
+    return ORJSONResponse(AccountLoginResponse(jid=jid, token=token).model_dump())
 
 
 @router.delete("", status_code=status.HTTP_200_OK)
 async def delete_account(
     body: AccountDeleteRequest,
     caller_jid: Annotated[str, Depends(verify_token)],
-) -> dict:
+) -> ORJSONResponse:
     """Delete a user account and all associated data.
 
     The caller must provide their current password for confirmation.
@@ -153,25 +169,20 @@ async def delete_account(
     pool = await get_pool()
     username = body.jid.split("@")[0]
 
-    async with pool.acquire() as conn:
-        async with conn.transaction():
-            # Remove push registrations
-            await conn.execute(
-                "DELETE FROM push_registrations WHERE jid = $1",
-                body.jid,
-            )
-
-            # Remove subscriber record (SIP auth)
-            await conn.execute(
-                "DELETE FROM subscriber WHERE username = $1",
-                username,
-            )
-
-            # Remove Ejabberd user record.
-            # Ejabberd stores users in its own `users` table when using SQL auth.
-            await conn.execute(
-                "DELETE FROM users WHERE username = $1",
-                username,
-            )
-
-    return {"status": "deleted"}
+    # One statement, so all three deletes run atomically in a single
+    # round-trip without an explicit BEGIN/COMMIT. Ejabberd stores users in
+    # its own `users` table when using SQL auth.
+    await pool.execute(
+        """
+        WITH push AS (
+            DELETE FROM push_registrations WHERE jid = $1
+        ), sip AS (
+            DELETE FROM subscriber WHERE username = $2
+        )
+        DELETE FROM users WHERE username = $2
+        """,
+        body.jid,
+        username,
+    )
+
+    return ORJSONResponse({"status": "deleted"})
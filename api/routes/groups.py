@@ -1,14 +1,18 @@
 """Group (MUC) management endpoints."""
 
+import asyncio
 import logging
 import os
 import uuid
 from typing import Annotated
 
 import httpx
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 
 from auth import verify_token
+from ejabberd import get_client
 from models import (
     GroupAddMemberRequest,
     GroupCreateRequest,
@@ -23,76 +27,82 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/groups", tags=["groups"])
 
-_EJABBERD_API_URL = os.environ.get("EJABBERD_API_URL", "https://ejabberd:5443/api")
 _XMPP_DOMAIN = os.environ.get("XMPP_DOMAIN", "example.com")
+_MUC_SERVICE = f"muc.{_XMPP_DOMAIN}"
 
+# Room option lookups for one listing share the admin API connection pool
+# with every other request; cap how many are in flight across all of them.
+_MAX_CONCURRENT_ROOM_LOOKUPS = 20
+_room_lookup_slots = asyncio.Semaphore(_MAX_CONCURRENT_ROOM_LOOKUPS)
 
-@router.post("", status_code=status.HTTP_201_CREATED, response_model=GroupCreateResponse)
+
+@router.post(
+    "",
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_201_CREATED: {"model": GroupCreateResponse}},
+)
 async def create_group(
     body: GroupCreateRequest,
     caller_jid: Annotated[str, Depends(verify_token)],
-) -> GroupCreateResponse:
+) -> ORJSONResponse:
     """Create a new MUC room and set affiliations."""
     room_id = str(uuid.uuid4())
-    muc_service = f"muc.{_XMPP_DOMAIN}"
 
-    try:
-        async with httpx.AsyncClient(verify=False) as client:
-            # Create the room with options
-            resp = await client.post(
-                f"{_EJABBERD_API_URL}/create_room_with_opts",
-                json={
-                    "name": room_id,
-                    "service": muc_service,
-                    "host": _XMPP_DOMAIN,
-                    "options": [
-                        {"name": "title", "value": body.name},
-                        {"name": "persistentroom", "value": "true"},
-                        {"name": "membersonly", "value": "true"},
-                        {"name": "allow_user_invites", "value": "true"},
-                        {"name": "mam", "value": "true"},
-                    ],
-                },
-                timeout=10.0,
-            )
-            if resp.status_code not in (200, 201):
-                logger.error("create_room_with_opts returned %s: %s", resp.status_code, resp.text)
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail="Failed to create group room.",
-                )
+    client = get_client()
 
-            # Set creator as owner
-            resp = await client.post(
-                f"{_EJABBERD_API_URL}/set_room_affiliation",
-                json={
-                    "name": room_id,
-                    "service": muc_service,
-                    "jid": caller_jid,
-                    "affiliation": "owner",
-                },
-                timeout=10.0,
+    try:
+        # Create the room with options
+        resp = await client.post(
+            "/create_room_with_opts",
+            json={
+                "name": room_id,
+                "service": _MUC_SERVICE,
+                "host": _XMPP_DOMAIN,
+                "options": [
+                    {"name": "title", "value": body.name},
+                    {"name": "persistentroom", "value": "true"},
+                    {"name": "membersonly", "value": "true"},
+                    {"name": "allow_user_invites", "value": "true"},
+                    {"name": "mam", "value": "true"},
+                ],
+            },
+        )
+        if resp.status_code not in (200, 201):
+            logger.error("create_room_with_opts returned %s: %s", resp.status_code, resp.text)
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail="Failed to create group room.",
             )
-            if resp.status_code != 200:
-                logger.error("set_room_affiliation (owner) returned %s: %s", resp.status_code, resp.text)
 
-            # Add initial members
-            for member_jid in body.member_jids:
-                resp = await client.post(
-                    f"{_EJABBERD_API_URL}/set_room_affiliation",
+        # Set creator as owner and add initial members. The affiliation
+        # calls are independent, so issue them concurrently.
+        affiliations = [(caller_jid, "owner")]
+        affiliations.extend((member_jid, "member") for member_jid in body.member_jids)
+        results = await asyncio.gather(
+            *(
+                client.post(
+                    "/set_room_affiliation",
                     json={
                         "name": room_id,
-                        "service": muc_service,
-                        "jid": member_jid,
-                        "affiliation": "member",
+                        "service": _MUC_SERVICE,
+                        "jid": jid,
+                        "affiliation": affiliation,
                     },
-                    timeout=10.0,
                 )
-                if resp.status_code != 200:
-                    logger.error(
-                        "set_room_affiliation (member %s) returned %s: %s",
-                        member_jid, resp.status_code, resp.text,
-                    )
+                for jid, affiliation in affiliations
+            ),
+            return_exceptions=True,
+        )
+        for (jid, affiliation), result in zip(affiliations, results):
+            if isinstance(result, BaseException):
+                logger.error(
+                    "set_room_affiliation (%s %s) failed", affiliation, jid, exc_info=result,
+                )
+            elif result.status_code != 200:
+                logger.error(
+                    "set_room_affiliation (%s %s) returned %s: %s",
+                    affiliation, jid, result.status_code, result.text,
+                )
     except httpx.HTTPError:
         logger.exception("Failed to reach Ejabberd admin API")
         raise HTTPException(
@@ -100,51 +110,72 @@ async def create_group(
             detail="Group service unavailable. Please try again later.",
         )
 
-    room_jid = f"{room_id}@{muc_service}"
-    return GroupCreateResponse(group_id=room_id, jid=room_jid, name=body.name)
+    room_jid = f"{room_id}@{_MUC_SERVICE}"
+    return ORJSONResponse(
+        GroupCreateResponse(group_id=room_id, jid=room_jid, name=body.name).model_dump(),
+        status_code=status.HTTP_201_CREATED,
+    )
 
 
-@router.get("", response_model=GroupListResponse)
+@router.get("", responses={status.HTTP_200_OK: {"model": GroupListResponse}})
 async def list_groups(
     caller_jid: Annotated[str, Depends(verify_token)],
-) -> GroupListResponse:
+) -> ORJSONResponse:
     """List MUC rooms the caller belongs to."""
     username = caller_jid.split("@")[0]
-    muc_service = f"muc.{_XMPP_DOMAIN}"
+
+    client = get_client()
+
+    async def _get_room_options(room_name: str) -> httpx.Response:
+        async with _room_lookup_slots:
+            return await client.post(
+                "/get_room_options",
+                json={"name": room_name, "service": _MUC_SERVICE},
+            )
 
     try:
-        async with httpx.AsyncClient(verify=False) as client:
-            resp = await client.post(
-                f"{_EJABBERD_API_URL}/get_user_rooms",
-                json={"user": username, "host": _XMPP_DOMAIN},
-                timeout=10.0,
+        resp = await client.post(
+            "/get_user_rooms",
+            json={"user": username, "host": _XMPP_DOMAIN},
+        )
+        if resp.status_code != 200:
+            logger.error("get_user_rooms returned %s: %s", resp.status_code, resp.text)
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail="Failed to list groups.",
             )
-            if resp.status_code != 200:
-                logger.error("get_user_rooms returned %s: %s", resp.status_code, resp.text)
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail="Failed to list groups.",
-                )
 
-            rooms = resp.json()
-            groups: list[GroupInfo] = []
-            for room_jid in rooms:
-                room_name = room_jid.split("@")[0] if isinstance(room_jid, str) else room_jid
-                # Get room title from options
-                opts_resp = await client.post(
-                    f"{_EJABBERD_API_URL}/get_room_options",
-                    json={"name": room_name, "service": muc_service},
-                    timeout=10.0,
+        rooms = orjson.loads(resp.content)
+        room_names = [
+            room_jid.split("@")[0] if isinstance(room_jid, str) else room_jid
+            for room_jid in rooms
+        ]
+        # Fetch every room's options concurrently to get the titles. Every
+        # lookup is awaited before any failure is raised, so none is left
+        # running unobserved after the 502.
+        opts_resps = await asyncio.gather(
+            *(_get_room_options(room_name) for room_name in room_names),
+            return_exceptions=True,
+        )
+        for opts_resp in opts_resps:
+            if isinstance(opts_resp, BaseException):
+                raise opts_resp
+
+        groups: list[GroupInfo] = []
+        for room_jid, room_name, opts_resp in zip(rooms, room_names, opts_resps):
+            title = room_name
+            if opts_resp.status_code == 200:
+                title = next(
+                    (
+                        opt["value"]
+                        for opt in orjson.loads(opts_resp.content)
+                        if opt.get("name") == "title" and opt.get("value")
+                    ),
+                    room_name,
                 )
-                title = room_name
-                if opts_resp.status_code == 200:
-                    for opt in opts_resp.json():
-                        if opt.get("name") == "title" and opt.get("value"):
-                            title = opt["value"]
-                            break
 
-                full_jid = room_jid if "@" in str(room_jid) else f"{room_jid}@{muc_service}"
-                groups.append(GroupInfo(group_id=room_name, jid=full_jid, name=title))
+            full_jid = room_jid if "@" in str(room_jid) else f"{room_jid}@{_MUC_SERVICE}"
+            groups.append(GroupInfo(group_id=room_name, jid=full_jid, name=title))
 
     except httpx.HTTPError:
         logger.exception("Failed to reach Ejabberd admin API")
@@ -153,24 +184,23 @@ async def list_groups(
             detail="Group service unavailable. Please try again later.",
         )
 
-    return GroupListResponse(groups=groups)
+    return ORJSONResponse(GroupListResponse(groups=groups).model_dump())
 
 
-@router.get("/{group_id}/members", response_model=GroupMembersResponse)
+@router.get("/{group_id}/members", responses={status.HTTP_200_OK: {"model": GroupMembersResponse}})
 async def list_members(
     group_id: str,
     caller_jid: Annotated[str, Depends(verify_token)],
-) -> GroupMembersResponse:
+) -> ORJSONResponse:
     """List members of a MUC room."""
-    muc_service = f"muc.{_XMPP_DOMAIN}"
+
+    client = get_client()
 
     try:
-        async with httpx.AsyncClient(verify=False) as client:
-            resp = await client.post(
-                f"{_EJABBERD_API_URL}/get_room_affiliations",
-                json={"name": group_id, "service": muc_service},
-                timeout=10.0,
-            )
+        resp = await client.post(
+            "/get_room_affiliations",
+            json={"name": group_id, "service": _MUC_SERVICE},
+        )
     except httpx.HTTPError:
         logger.exception("Failed to reach Ejabberd admin API")
         raise HTTPException(
@@ -198,7 +228,7 @@ async def list_members(
         )
         for entry in affiliations
     ]
-    return GroupMembersResponse(members=members)
+    return ORJSONResponse(GroupMembersResponse(members=members).model_dump())
 
 
 @router.post("/{group_id}/members", status_code=status.HTTP_200_OK)
@@ -206,22 +236,21 @@ async def add_member(
     group_id: str,
     body: GroupAddMemberRequest,
     caller_jid: Annotated[str, Depends(verify_token)],
-) -> dict:
+) -> ORJSONResponse:
     """Add a member to a MUC room."""
-    muc_service = f"muc.{_XMPP_DOMAIN}"
+
+    client = get_client()
 
     try:
-        async with httpx.AsyncClient(verify=False) as client:
-            resp = await client.post(
-                f"{_EJABBERD_API_URL}/set_room_affiliation",
-                json={
-                    "name": group_id,
-                    "service": muc_service,
-                    "jid": body.jid,
-                    "affiliation": "member",
-                },
-                timeout=10.0,
-            )
+        resp = await client.post(
+            "/set_room_affiliation",
+            json={
+                "name": group_id,
+                "service": _MUC_SERVICE,
+                "jid": body.jid,
+                "affiliation": "member",
+            },
+        )
     except httpx.HTTPError:
         logger.exception("Failed to reach Ejabberd admin API")
         raise HTTPException(
@@ -236,7 +265,7 @@ async def add_member(
             detail="Failed to add member.",
         )
 
-    return {"status": "ok"}
+    return ORJSONResponse({"status": "ok"})
 
 
 @router.delete("/{group_id}/members/{jid}", status_code=status.HTTP_200_OK)
@@ -244,22 +273,21 @@ async def remove_member(
     group_id: str,
     jid: str,
     caller_jid: Annotated[str, Depends(verify_token)],
-) -> dict:
+) -> ORJSONResponse:
     """Remove a member from a MUC room."""
-    muc_service = f"muc.{_XMPP_DOMAIN}"
+
+    client = get_client()
 
     try:
-        async with httpx.AsyncClient(verify=False) as client:
-            resp = await client.post(
-                f"{_EJABBERD_API_URL}/set_room_affiliation",
-                json={
-                    "name": group_id,
-                    "service": muc_service,
-                    "jid": jid,
-                    "affiliation": "none",
-                },
-                timeout=10.0,
-            )
+        resp = await client.post(
+            "/set_room_affiliation",
+            json={
+                "name": group_id,
+                "service": _MUC_SERVICE,
+                "jid": jid,
+                "affiliation": "none",
+            },
+        )
     except httpx.HTTPError:
         logger.exception("Failed to reach Ejabberd admin API")
         raise HTTPException(
@@ -274,4 +302,4 @@ async def remove_member(
             detail="Failed to remove member.",
         )
 
-    return {"status": "ok"}
+    return ORJSONResponse({"status": "ok"})
@@ -1,10 +1,13 @@
 """Push notification registration and call-notify endpoints (INTERFACES.md §4.1 / §4.2)."""
 
+import asyncio
 import logging
 import os
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse
 
 from auth import verify_token
 from db import get_pool
@@ -17,13 +20,17 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1/push", tags=["push"])
 
 _XMPP_DOMAIN = os.environ.get("XMPP_DOMAIN", "example.com")
+_JID_SUFFIX = f"@{_XMPP_DOMAIN}"
 
+# The registration response never varies, so serialize it once.
+_REGISTERED = orjson.dumps(PushRegisterResponse().model_dump())
 
-@router.post("/register", response_model=PushRegisterResponse)
+
+@router.post("/register", responses={status.HTTP_200_OK: {"model": PushRegisterResponse}})
 async def register_push(
     body: PushRegisterRequest,
     caller_jid: Annotated[str, Depends(verify_token)],
-) -> PushRegisterResponse:
+) -> Response:
     """Register a device push token for APNs or FCM delivery."""
     if body.jid != caller_jid:
         raise HTTPException(
@@ -48,14 +55,14 @@ async def register_push(
         body.push_token,
         body.app_id,
     )
-    return PushRegisterResponse(status="registered")
+    return Response(content=_REGISTERED, media_type="application/json")
 
 
 @router.delete("/register", status_code=status.HTTP_200_OK)
 async def deregister_push(
     body: PushDeregisterRequest,
     caller_jid: Annotated[str, Depends(verify_token)],
-) -> dict:
+) -> ORJSONResponse:
     """Remove a device's push token."""
     if body.jid != caller_jid:
         raise HTTPException(
@@ -74,11 +81,11 @@ async def deregister_push(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Push registration not found",
         )
-    return {"status": "deregistered"}
+    return ORJSONResponse({"status": "deregistered"})
 
 
 @router.post("/call-notify", status_code=status.HTTP_200_OK)
-async def call_notify(body: CallNotifyRequest) -> dict:
+async def call_notify(body: CallNotifyRequest) -> ORJSONResponse:
     """Send VoIP push notifications for an incoming call.
 
     Called by Kamailio when a callee is not registered (internal webhook,
@@ -92,7 +99,7 @@ async def call_notify(body: CallNotifyRequest) -> dict:
     Push payload contains only caller_name, call_id, call_type — zero
     plaintext message content.
     """
-    callee_jid = f"{body.callee_username}@{_XMPP_DOMAIN}"
+    callee_jid = body.callee_username + _JID_SUFFIX
     caller_display = body.caller_display_name or body.caller_username
 
     pool = await get_pool()
@@ -103,49 +110,48 @@ async def call_notify(body: CallNotifyRequest) -> dict:
 
     if not rows:
         logger.info("No push registrations found for %s", callee_jid)
-        return {"status": "no_registrations", "sent": 0}
+        return ORJSONResponse({"status": "no_registrations", "sent": 0})
+
+    ios_rows = [row for row in rows if row["platform"] == "ios"]
+    android_rows = [row for row in rows if row["platform"] == "android"]
+
+    # Send to every device concurrently so call setup waits for the slowest
+    # push rather than the sum of all of them.
+    ios_results, android_results = await asyncio.gather(
+        apns_service.send_voip_push_many(
+            [row["push_token"] for row in ios_rows],
+            caller_name=caller_display,
+            call_id=body.call_id,
+            call_type=body.call_type,
+        ),
+        fcm_service.send_call_push_many(
+            [row["push_token"] for row in android_rows],
+            caller_name=caller_display,
+            call_id=body.call_id,
+            call_type=body.call_type,
+        ),
+    )
+
+    results = [(row["device_uuid"], ios_results[row["push_token"]]) for row in ios_rows]
+    results.extend((row["device_uuid"], android_results[row["push_token"]]) for row in android_rows)
 
     sent = 0
-    bad_tokens: list[tuple[str, str]] = []
-
-    for row in rows:
-        platform = row["platform"]
-        token = row["push_token"]
-        device_uuid = row["device_uuid"]
-
-        if platform == "ios":
-            result = await apns_service.send_voip_push(
-                device_token=token,
-                caller_name=caller_display,
-                call_id=body.call_id,
-                call_type=body.call_type,
-            )
-            if result is True:
-                sent += 1
-            elif result is False:
-                # Explicitly rejected — bad token
-                bad_tokens.append((callee_jid, device_uuid))
-            # result is None means not configured — skip silently
-        elif platform == "android":
-            result = fcm_service.send_call_push(
-                device_token=token,
-                caller_name=caller_display,
-                call_id=body.call_id,
-                call_type=body.call_type,
-            )
-            if result is True:
-                sent += 1
-            elif result is False:
-                bad_tokens.append((callee_jid, device_uuid))
-
-    # Clean up bad tokens
-    if bad_tokens:
-        async with pool.acquire() as conn:
-            for jid, device_uuid in bad_tokens:
-                await conn.execute(
-                    "DELETE FROM push_registrations WHERE jid = $1 AND device_uuid = $2",
-                    jid, device_uuid,
-                )
-        logger.info("Cleaned up %d bad push tokens for %s", len(bad_tokens), callee_jid)
-
-    return {"status": "sent", "sent": sent}
+    bad_devices: list[str] = []
+    for device_uuid, result in results:
+        if result is True:
+            sent += 1
+        elif result is False:
+            # Explicitly rejected — bad token
+            bad_devices.append(device_uuid)
+        # result is None means not configured or a transient failure — skip silently
+
+    # Clean up bad tokens in a single round-trip
+    if bad_devices:
+        await pool.execute(
+            "DELETE FROM push_registrations WHERE jid = $1 AND device_uuid = ANY($2::text[])",
+            callee_jid,
+            bad_devices,
+        )
+        logger.info("Cleaned up %d bad push tokens for %s", len(bad_devices), callee_jid)
+
+    return ORJSONResponse({"status": "sent", "sent": sent})
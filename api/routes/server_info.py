@@ -2,19 +2,19 @@
 
 import os
 
-from fastapi import APIRouter
+import orjson
+from fastapi import APIRouter, Response, status
 
 from models import ServerInfoResponse
 
 router = APIRouter(prefix="/api/v1/server", tags=["server"])
 
 
-@router.get("/info", response_model=ServerInfoResponse)
-async def server_info() -> ServerInfoResponse:
-    """Return server endpoints for client bootstrap.
+def _build_server_info() -> bytes:
+    """Serialize the discovery payload from the environment.
 
-    This is the first endpoint clients call on startup to discover
-    XMPP, SIP, TURN, and upload service locations.
+    The values cannot change for the lifetime of the process, so this runs
+    once at import and the handler serves the cached bytes.
     """
     xmpp_domain = os.environ.get("XMPP_DOMAIN", "example.com")
     xmpp_host = os.environ.get("XMPP_HOST", f"xmpp.{xmpp_domain}")
@@ -25,7 +25,7 @@ async def server_info() -> ServerInfoResponse:
     server_version = os.environ.get("SERVER_VERSION", "1.0.0")
     min_client_version = os.environ.get("MIN_CLIENT_VERSION", "1.0.0")
 
-    return ServerInfoResponse(
+    info = ServerInfoResponse(
         xmpp_domain=xmpp_domain,
         xmpp_host=xmpp_host,
         xmpp_port_tls=5223,
@@ -39,3 +39,18 @@ async def server_info() -> ServerInfoResponse:
         server_version=server_version,
         min_client_version=min_client_version,
     )
+    return orjson.dumps(info.model_dump())
+
+
+_SERVER_INFO = _build_server_info()
+_CACHE_HEADERS = {"Cache-Control": "public, max-age=300"}
+
+
+@router.get("/info", responses={status.HTTP_200_OK: {"model": ServerInfoResponse}})
+async def server_info() -> Response:
+    """Return server endpoints for client bootstrap.
+
+    This is the first endpoint clients call on startup to discover
+    XMPP, SIP, TURN, and upload service locations.
+    """
+    return Response(content=_SERVER_INFO, media_type="application/json", headers=_CACHE_HEADERS)
@@ -1,13 +1,13 @@
 """TURN credential generation endpoint (MODULE_01_BACKEND.md §3.3)."""
 
-import base64
 import hashlib
-import hmac
 import os
-import time
+from binascii import b2a_base64
+from time import time
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import ORJSONResponse
 
 from auth import verify_token
 from models import TurnCredentialsResponse
@@ -16,38 +16,68 @@ router = APIRouter(prefix="/api/v1/turn", tags=["turn"])
 
 _TURN_CREDENTIAL_TTL = 86400  # 24 hours
 
+# The secret and domain are fixed for the lifetime of the process, so encode
+# the key and build the URI list once rather than on every request.
+_TURN_SECRET = os.environ["TURN_SECRET"].encode()
+_TURN_DOMAIN = os.environ.get("TURN_DOMAIN", "turn.example.com")
+_TURN_URIS = (
+    f"turn:{_TURN_DOMAIN}:3478?transport=udp",
+    f"turn:{_TURN_DOMAIN}:3478?transport=tcp",
+    f"turns:{_TURN_DOMAIN}:5349?transport=tcp",
+)
 
-@router.get("/credentials", response_model=TurnCredentialsResponse)
+# Must match the TURN server's REST API digest; the bundled coturn verifies SHA-1.
+_TURN_HMAC_ALGO = os.environ.get("TURN_HMAC_ALGO", "sha1")
+if _TURN_HMAC_ALGO not in ("sha1", "sha256"):
+    raise ValueError(f"Unsupported TURN_HMAC_ALGO: {_TURN_HMAC_ALGO!r}")
+
+
+def _hmac_key_schedule(key: bytes, algo: str) -> tuple["hashlib._Hash", "hashlib._Hash"]:
+    """Return hash states primed with ``key ^ ipad`` and ``key ^ opad`` (RFC 2104).
+
+    The key is constant, so each request copies these states instead of
+    re-hashing the padded key blocks.
+    """
+    inner = hashlib.new(algo)
+    outer = hashlib.new(algo)
+    if len(key) > inner.block_size:
+        key = hashlib.new(algo, key).digest()
+    key = key.ljust(inner.block_size, b"\0")
+    inner.update(bytes(b ^ 0x36 for b in key))
+    outer.update(bytes(b ^ 0x5C for b in key))
+    return inner, outer
+
+
+_HMAC_INNER, _HMAC_OUTER = _hmac_key_schedule(_TURN_SECRET, _TURN_HMAC_ALGO)
+
+
+@router.get("/credentials", responses={status.HTTP_200_OK: {"model": TurnCredentialsResponse}})
 async def turn_credentials(
     caller_jid: Annotated[str, Depends(verify_token)],
-) -> TurnCredentialsResponse:
+) -> ORJSONResponse:
     """Generate time-limited TURN credentials using the shared secret.
 
     The credential format follows the TURN REST API spec (draft-uberti-behave-turn-rest):
     username = "{expiry_timestamp}:{user_identifier}"
     password = base64(HMAC-SHA1(secret, username))
-    """
-    secret = os.environ["TURN_SECRET"]
-    turn_domain = os.environ.get("TURN_DOMAIN", "turn.example.com")
 
-    username_part = caller_jid.split("@")[0]
-    expiry = int(time.time()) + _TURN_CREDENTIAL_TTL
+    SHA-256 is used instead when ``TURN_HMAC_ALGO=sha256``.
+    """
+    username_part = caller_jid.partition("@")[0]
+    expiry = int(time()) + _TURN_CREDENTIAL_TTL
     turn_username = f"{expiry}:{username_part}"
 
-    hmac_value = hmac.new(
-        secret.encode(),
-        turn_username.encode(),
-        hashlib.sha1,
-    ).digest()
-    password = base64.b64encode(hmac_value).decode()
+    inner = _HMAC_INNER.copy()
+    inner.update(turn_username.encode())
+    outer = _HMAC_OUTER.copy()
+    outer.update(inner.digest())
+    hmac_value = outer.digest()
+    password = b2a_base64(hmac_value, newline=False).decode("ascii")
 
-    return TurnCredentialsResponse(
+    creds = TurnCredentialsResponse(
         username=turn_username,
         password=password,
         ttl=_TURN_CREDENTIAL_TTL,
-        uris=[
-            f"turn:{turn_domain}:3478?transport=udp",
-            f"turn:{turn_domain}:3478?transport=tcp",
-            f"turns:{turn_domain}:5349?transport=tcp",
-        ],
+        uris=list(_TURN_URIS),
     )
+    return ORJSONResponse(creds.model_dump())
@@ -0,0 +1,6 @@
+"""Push delivery services."""
+
+
+def token_preview(device_token: str) -> str:
+    """Shorten a device token for logging so full tokens never reach the logs."""
+    return f"{device_token[:8]}...{device_token[-4:]}"
@@ -4,23 +4,43 @@ Sends VoIP pushes via the APNs HTTP/2 provider API using aioapns.
 Push payloads contain zero plaintext message content (SECURITY_MODEL.md).
 """
 
+import asyncio
 import logging
 import os
 from pathlib import Path
 
 from aioapns import APNs, NotificationRequest, ConnectionError
 
+from services import token_preview
+
 logger = logging.getLogger(__name__)
 
 _client: APNs | None = None
+_initialized = False
 
+# APNs limits concurrent HTTP/2 streams per connection; stay well below the
+# advertised maximum so bursts queue here instead of being refused.
+_MAX_CONCURRENT_STREAMS = 100
+_stream_slots = asyncio.Semaphore(_MAX_CONCURRENT_STREAMS)
 
-def _get_client() -> APNs | None:
-    """Lazily initialize the APNs client. Returns None if not configured."""
-    global _client
-    if _client is not None:
+# APNs rejection reasons meaning the device token will never work again.
+_BAD_TOKEN_REASONS = frozenset({"BadDeviceToken", "Unregistered", "ExpiredToken"})
+
+
+def get_client() -> APNs | None:
+    """Lazily initialize the APNs client. Returns None if not configured.
+
+    Configuration is only checked on the first call; later calls return the
+    cached result without re-reading the environment or the key file. The
+    app lifespan calls this at startup so the key file and TLS context are
+    loaded before the first call push. No connection is opened then, since
+    aioapns closes connections after 10 seconds of inactivity.
+    """
+    global _client, _initialized
+    if _initialized:
         return _client
 
+    _initialized = True
     key_path = os.environ.get("APNS_KEY_PATH", "")
     key_id = os.environ.get("APNS_KEY_ID", "")
     team_id = os.environ.get("APNS_TEAM_ID", "")
@@ -33,60 +53,102 @@ def _get_client() -> APNs | None:
         logger.warning("APNs key file not found at %s", key_path)
         return None
 
-    _client = APNs(
-        key=key_path,
-        key_id=key_id,
-        team_id=team_id,
-        topic=os.environ.get("APNS_BUNDLE_ID", "com.example.veil") + ".voip",
-        use_sandbox=os.environ.get("APNS_USE_SANDBOX", "true").lower() == "true",
-    )
+    try:
+        _client = APNs(
+            key=key_path,
+            key_id=key_id,
+            team_id=team_id,
+            topic=os.environ.get("APNS_BUNDLE_ID", "com.example.veil") + ".voip",
+            use_sandbox=os.environ.get("APNS_USE_SANDBOX", "true").lower() == "true",
+        )
+    except Exception:
+        logger.exception("Failed to initialize APNs client")
+        return None
     return _client
 
 
-async def send_voip_push(
-    device_token: str,
+def close_client() -> None:
+    global _client, _initialized
+    if _client is not None:
+        _client.pool.close()
+        _client = None
+    _initialized = False
+
+
+async def send_voip_push_many(
+    device_tokens: list[str],
     caller_name: str,
     call_id: str,
     call_type: str,
-) -> bool | None:
-    """Send a VoIP push notification to an iOS device.
-
-    Returns True if the push was accepted, False if the token is bad/rejected,
-    or None if APNs is not configured.
+) -> dict[str, bool | None]:
+    """Send the same VoIP push notification to several iOS devices.
+
+    All requests are multiplexed concurrently over the client's HTTP/2
+    connection, bounded by ``_MAX_CONCURRENT_STREAMS`` in flight.
+    Returns a mapping of device token to True if the push was accepted,
+    False if APNs reported the token as bad, or None if APNs is not
+    configured or the send failed for a reason unrelated to the token.
     The payload contains only caller_name, call_id, and call_type — no plaintext content.
     """
-    client = _get_client()
+    if not device_tokens:
+        return {}
+
+    client = get_client()
     if client is None:
-        logger.info("APNs not configured — skipping VoIP push to %s...%s", device_token[:8], device_token[-4:])
+        logger.info("APNs not configured — skipping VoIP push to %d device(s)", len(device_tokens))
+        return dict.fromkeys(device_tokens)
+
+    message = {
+        "caller_name": caller_name,
+        "call_id": call_id,
+        "call_type": call_type,
+    }
+
+    async def _send(device_token: str) -> bool | None:
+        request = NotificationRequest(
+            device_token=device_token,
+            message=message,
+            push_type="voip",
+        )
+        try:
+            async with _stream_slots:
+                response = await client.send_notification(request)
+        except ConnectionError:
+            logger.exception("APNs connection error sending to %s", token_preview(device_token))
+            return None
+        if response.is_successful:
+            return True
+        if is_bad_token_error(response.description):
+            logger.warning(
+                "APNs rejected token %s: %s",
+                token_preview(device_token),
+                response.description,
+            )
+            return False
+        logger.error(
+            "APNs send error for %s: %s",
+            token_preview(device_token),
+            response.description,
+        )
         return None
 
-    request = NotificationRequest(
-        device_token=device_token,
-        message={
-            "caller_name": caller_name,
-            "call_id": call_id,
-            "call_type": call_type,
-        },
-        push_type="voip",
+    outcomes = await asyncio.gather(
+        *(_send(token) for token in device_tokens),
+        return_exceptions=True,
     )
-
-    try:
-        response = await client.send_notification(request)
-        if not response.is_successful:
+    results: dict[str, bool | None] = {}
+    for device_token, outcome in zip(device_tokens, outcomes):
+        if isinstance(outcome, BaseException):
             logger.error(
-                "APNs rejected push for token %s...%s: %s",
-                device_token[:8], device_token[-4:],
-                response.description,
+                "APNs send error for %s",
+                token_preview(device_token),
+                exc_info=outcome,
             )
-            return False
-        return True
-    except ConnectionError:
-        logger.exception("APNs connection error sending to %s...%s", device_token[:8], device_token[-4:])
-        return False
+            outcome = None
+        results[device_token] = outcome
+    return results
 
 
 def is_bad_token_error(description: str | None) -> bool:
     """Check if an APNs error indicates a bad/expired device token."""
-    if description is None:
-        return False
-    return description in ("BadDeviceToken", "Unregistered", "ExpiredToken")
+    return description in _BAD_TOKEN_REASONS
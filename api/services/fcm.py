@@ -4,18 +4,30 @@ Sends high-priority data-only FCM messages via firebase-admin SDK.
 Push payloads contain zero plaintext message content (SECURITY_MODEL.md).
 """
 
+import asyncio
 import logging
 import os
 from pathlib import Path
 
 import firebase_admin
-from firebase_admin import credentials, messaging
+from firebase_admin import credentials, exceptions, messaging
+
+from services import token_preview
 
 logger = logging.getLogger(__name__)
 
 _app: firebase_admin.App | None = None
 _initialized = False
 
+_WARM_UP_TIMEOUT = 10.0  # seconds; startup must not hang on an unreachable Google
+
+# Call pushes are always high priority and useless after a minute. The SDK
+# only reads the config when encoding, so one instance serves every message.
+_ANDROID_CONFIG = messaging.AndroidConfig(
+    priority="high",
+    ttl=60,
+)
+
 
 def _ensure_initialized() -> bool:
     """Lazily initialize the Firebase Admin SDK. Returns True if ready."""
@@ -39,50 +51,79 @@ def _ensure_initialized() -> bool:
         return False
 
 
-def send_call_push(
-    device_token: str,
+async def warm_up() -> None:
+    """Initialize the SDK and fetch its OAuth access token before the first push.
+
+    Called from the app lifespan so the token exchange with Google is not
+    paid by the first incoming call after a restart. The messaging client
+    shares this credential, so the cached token is reused until it expires.
+    Failures are only logged; the token is fetched again on the first push.
+    """
+    if not _ensure_initialized():
+        return
+    try:
+        await asyncio.wait_for(asyncio.to_thread(_app.credential.get_access_token), timeout=_WARM_UP_TIMEOUT)
+    except Exception:
+        logger.warning("FCM warm-up token fetch failed — will authenticate on first push", exc_info=True)
+
+
+async def send_call_push_many(
+    device_tokens: list[str],
     caller_name: str,
     call_id: str,
     call_type: str,
-) -> bool | None:
-    """Send a high-priority data-only FCM message for an incoming call.
-
-    Returns True if the message was accepted, False if the token is bad/rejected,
-    or None if FCM is not configured.
+) -> dict[str, bool | None]:
+    """Send the same high-priority data-only FCM message to several Android devices.
+
+    ``messaging.send_each_async`` issues the sends concurrently over
+    firebase-admin's async HTTP/2 client, so no worker threads are needed.
+    Returns a mapping of device token to True if the message was accepted,
+    False if the token is bad/rejected, or None if FCM is not configured or
+    the send failed for a reason unrelated to the token.
     The payload contains only caller_name, call_id, and call_type — no plaintext content.
     """
+    if not device_tokens:
+        return {}
+
     if not _ensure_initialized():
-        logger.info("FCM not configured — skipping push to %s...%s", device_token[:8], device_token[-4:])
-        return None
-
-    message = messaging.Message(
-        token=device_token,
-        data={
-            "type": "call",
-            "caller_name": caller_name,
-            "call_id": call_id,
-            "call_type": call_type,
-        },
-        android=messaging.AndroidConfig(
-            priority="high",
-            ttl=60,
-        ),
-    )
+        logger.info("FCM not configured — skipping push to %d device(s)", len(device_tokens))
+        return dict.fromkeys(device_tokens)
+
+    data = {
+        "type": "call",
+        "caller_name": caller_name,
+        "call_id": call_id,
+        "call_type": call_type,
+    }
+    messages = [messaging.Message(token=token, data=data, android=_ANDROID_CONFIG) for token in device_tokens]
 
     try:
-        messaging.send(message)
-        return True
-    except messaging.UnregisteredError:
-        logger.warning("FCM token unregistered: %s...%s", device_token[:8], device_token[-4:])
-        return False
-    except messaging.InvalidArgumentError:
-        logger.error("FCM invalid token: %s...%s", device_token[:8], device_token[-4:])
-        return False
+        batch = await messaging.send_each_async(messages)
     except Exception:
-        logger.exception("FCM send error for %s...%s", device_token[:8], device_token[-4:])
-        return False
+        logger.exception("FCM send error for %d device(s)", len(device_tokens))
+        return dict.fromkeys(device_tokens)
+
+    results: dict[str, bool | None] = {}
+    for device_token, response in zip(device_tokens, batch.responses):
+        if response.success:
+            results[device_token] = True
+        elif is_bad_token_error(response.exception):
+            logger.warning(
+                "FCM rejected token %s: %s",
+                token_preview(device_token),
+                response.exception,
+            )
+            results[device_token] = False
+        else:
+            logger.error(
+                "FCM send error for %s: %s",
+                token_preview(device_token),
+                response.exception,
+            )
+            results[device_token] = None
+    return results
 
 
 def is_bad_token_error(error: Exception) -> bool:
     """Check if an FCM error indicates a bad/expired device token."""
-    return isinstance(error, (messaging.UnregisteredError, messaging.InvalidArgumentError))
+    return isinstance(error, (messaging.UnregisteredError, exceptions.InvalidArgumentError))
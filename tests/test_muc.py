@@ -11,16 +11,18 @@ MUC module is loaded and the subdomain is routed.
 """
 
 import socket
+import ssl
 
 import pytest
 
-from conftest import XMPP_HOST, XMPP_PORT_TLS, XMPP_DOMAIN
+from conftest import XMPP_DOMAIN, XMPP_HOST, XMPP_PORT_TLS, XMPP_STREAM_HEADER, read_stream_features
 
 
+@pytest.mark.requires_backend(XMPP_HOST, XMPP_PORT_TLS)
 class TestMucConfiguration:
     """Verify the MUC module is active and the host is reachable."""
 
-    def test_muc_disco_items_in_stream(self) -> None:
+    def test_muc_disco_items_in_stream(self, tls_context: ssl.SSLContext) -> None:
         """Connect to XMPP and send a disco#items query to check for MUC.
 
         This is a lightweight check — we send a stream header and a disco
@@ -28,32 +30,15 @@ class TestMucConfiguration:
         client test would authenticate first, but this validates the
         module is loaded.
         """
-        import ssl
-
-        context = ssl.create_default_context()
-        context.check_hostname = False
-        context.verify_mode = ssl.CERT_NONE
-
         raw_sock = socket.create_connection((XMPP_HOST, XMPP_PORT_TLS), timeout=5)
         try:
-            tls_sock = context.wrap_socket(raw_sock, server_hostname=XMPP_DOMAIN)
+            tls_sock = tls_context.wrap_socket(raw_sock, server_hostname=XMPP_DOMAIN)
             try:
                 # Open stream
-                stream_header = (
-                    f"<?xml version='1.0'?>"
-                    f"<stream:stream xmlns='jabber:client' "
-                    f"xmlns:stream='http://etherx.jabber.org/streams' "
-                    f"to='{XMPP_DOMAIN}' version='1.0'>"
-                ).encode()
-                tls_sock.sendall(stream_header)
+                tls_sock.sendall(XMPP_STREAM_HEADER)
 
                 # Read stream features (we won't auth, just verify the connection)
-                data = b""
-                while b"</stream:features>" not in data:
-                    chunk = tls_sock.recv(4096)
-                    if not chunk:
-                        break
-                    data += chunk
+                data = read_stream_features(tls_sock)
 
                 # The features should be present — this confirms the server is
                 # running and TLS works. Full MUC testing requires authentication.
@@ -4,16 +4,17 @@ Tests verify:
 - POST /api/v1/push/register creates a push registration
 - POST /api/v1/push/register updates an existing registration (upsert)
 - DELETE /api/v1/push/register removes a registration
-- Requests without a valid Bearer token are rejected (401)
+- Requests without a valid Bearer token are rejected (401), including
+  expired, not-yet-valid, wrongly signed, ``sub``-less and ``aud``-bearing tokens
 - Requests with mismatched JID are rejected (403)
 - GET /api/v1/server/info returns expected server discovery payload
 - GET /api/v1/turn/credentials returns time-limited TURN credentials
 - DELETE /api/v1/account removes user data
 """
 
+import json
 import time
 
-import jwt
 import pytest
 
 try:
@@ -23,30 +24,45 @@ try:
 except ImportError:
     _HAS_HTTPX = False
 
-from conftest import API_BASE_URL
+from conftest import API_ADDRESS, make_token, sign_claims
 
-# A test JWT secret — must match the JWT_SECRET env var of the running API service.
-_JWT_SECRET = "test-jwt-secret"
+_JSON_CONTENT_TYPE = {"Content-Type": "application/json"}
 
 
-def _make_token(jid: str, secret: str = _JWT_SECRET, exp_delta: int = 3600) -> str:
-    payload = {"sub": jid, "exp": int(time.time()) + exp_delta}
-    return jwt.encode(payload, secret, algorithm="HS256")
+def _register_body(device_id: str, platform: str, push_token: str) -> bytes:
+    return json.dumps(
+        {
+            "jid": "alice@example.com",
+            "device_id": device_id,
+            "platform": platform,
+            "push_token": push_token,
+            "app_id": "com.example.veil",
+        }
+    ).encode()
+
+
+# Request bodies are encoded once at import rather than by httpx on every call.
+_UPSERT_BODIES = (
+    _register_body("550e8400-e29b-41d4-a716-446655440000", "ios", "apns-test-token-002"),
+    _register_body("550e8400-e29b-41d4-a716-446655440000", "ios", "apns-test-token-003"),
+)
+_DEREG_REGISTER_BODY = _register_body("deregister-test-device", "android", "fcm-test-token")
+_DEREG_BODY = json.dumps(
+    {"jid": "alice@example.com", "device_id": "deregister-test-device"}
+).encode()
 
 
 @pytest.mark.skipif(not _HAS_HTTPX, reason="httpx not installed")
+@pytest.mark.xdist_group(name="push_api")
+@pytest.mark.requires_backend(*API_ADDRESS)
 class TestPushApi:
     """Push registration endpoint tests."""
 
-    @pytest.fixture()
-    def client(self) -> "httpx.Client":
-        return httpx.Client(base_url=API_BASE_URL, timeout=10)
-
     def _auth_header(self, jid: str = "alice@example.com") -> dict:
-        return {"Authorization": f"Bearer {_make_token(jid)}"}
+        return {"Authorization": f"Bearer {make_token(jid)}"}
 
-    def test_register_push_token(self, client: "httpx.Client") -> None:
-        resp = client.post(
+    def test_register_push_token(self, api_client: "httpx.Client") -> None:
+        resp = api_client.post(
             "/api/v1/push/register",
             json={
                 "jid": "alice@example.com",
@@ -60,50 +76,26 @@ class TestPushApi:
         assert resp.status_code == 200
         assert resp.json()["status"] == "registered"
 
-    def test_register_push_upsert(self, client: "httpx.Client") -> None:
-        headers = self._auth_header()
-        body = {
-            "jid": "alice@example.com",
-            "device_id": "550e8400-e29b-41d4-a716-446655440000",
-            "platform": "ios",
-            "push_token": "apns-test-token-002",
-            "app_id": "com.example.veil",
-        }
-        resp1 = client.post("/api/v1/push/register", json=body, headers=headers)
+    def test_register_push_upsert(self, api_client: "httpx.Client") -> None:
+        headers = {**self._auth_header(), **_JSON_CONTENT_TYPE}
+        resp1 = api_client.post("/api/v1/push/register", content=_UPSERT_BODIES[0], headers=headers)
         assert resp1.status_code == 200
         # Update with a new token
-        body["push_token"] = "apns-test-token-003"
-        resp2 = client.post("/api/v1/push/register", json=body, headers=headers)
+        resp2 = api_client.post("/api/v1/push/register", content=_UPSERT_BODIES[1], headers=headers)
         assert resp2.status_code == 200
 
-    def test_deregister_push_token(self, client: "httpx.Client") -> None:
-        headers = self._auth_header()
+    def test_deregister_push_token(self, api_client: "httpx.Client") -> None:
+        headers = {**self._auth_header(), **_JSON_CONTENT_TYPE}
         # Register first
-        client.post(
-            "/api/v1/push/register",
-            json={
-                "jid": "alice@example.com",
-                "device_id": "deregister-test-device",
-                "platform": "android",
-                "push_token": "fcm-test-token",
-                "app_id": "com.example.veil",
-            },
-            headers=headers,
-        )
+        api_client.post("/api/v1/push/register", content=_DEREG_REGISTER_BODY, headers=headers)
         # Now deregister
-        resp = client.request(
-            "DELETE",
-            "/api/v1/push/register",
-            json={
-                "jid": "alice@example.com",
-                "device_id": "deregister-test-device",
-            },
-            headers=headers,
+        resp = api_client.request(
+            "DELETE", "/api/v1/push/register", content=_DEREG_BODY, headers=headers
         )
         assert resp.status_code == 200
 
-    def test_register_without_auth_returns_401(self, client: "httpx.Client") -> None:
-        resp = client.post(
+    def test_register_without_auth_returns_401(self, api_client: "httpx.Client") -> None:
+        resp = api_client.post(
             "/api/v1/push/register",
             json={
                 "jid": "alice@example.com",
@@ -115,9 +107,61 @@ class TestPushApi:
         )
         assert resp.status_code in (401, 403)
 
-    def test_register_jid_mismatch_returns_403(self, client: "httpx.Client") -> None:
+    def test_register_expired_token_returns_401(self, api_client: "httpx.Client") -> None:
+        resp = api_client.post(
+            "/api/v1/push/register",
+            content=_UPSERT_BODIES[0],
+            headers={
+                "Authorization": f"Bearer {make_token('alice@example.com', exp_delta=-60)}",
+                **_JSON_CONTENT_TYPE,
+            },
+        )
+        assert resp.status_code == 401
+
+    def test_register_wrong_secret_returns_401(self, api_client: "httpx.Client") -> None:
+        resp = api_client.post(
+            "/api/v1/push/register",
+            content=_UPSERT_BODIES[0],
+            headers={
+                "Authorization": f"Bearer {make_token('alice@example.com', secret='wrong')}",
+                **_JSON_CONTENT_TYPE,
+            },
+        )
+        assert resp.status_code == 401
+
+    def test_register_token_without_sub_returns_401(self, api_client: "httpx.Client") -> None:
+        token = sign_claims({"exp": int(time.time()) + 3600})
+        resp = api_client.post(
+            "/api/v1/push/register",
+            content=_UPSERT_BODIES[0],
+            headers={"Authorization": f"Bearer {token}", **_JSON_CONTENT_TYPE},
+        )
+        assert resp.status_code == 401
+
+    def test_register_not_yet_valid_token_returns_401(self, api_client: "httpx.Client") -> None:
+        now = int(time.time())
+        token = sign_claims({"sub": "alice@example.com", "exp": now + 3600, "nbf": now + 600})
+        resp = api_client.post(
+            "/api/v1/push/register",
+            content=_UPSERT_BODIES[0],
+            headers={"Authorization": f"Bearer {token}", **_JSON_CONTENT_TYPE},
+        )
+        assert resp.status_code == 401
+
+    def test_register_token_with_audience_returns_401(self, api_client: "httpx.Client") -> None:
+        token = sign_claims(
+            {"sub": "alice@example.com", "exp": int(time.time()) + 3600, "aud": "elsewhere"}
+        )
+        resp = api_client.post(
+            "/api/v1/push/register",
+            content=_UPSERT_BODIES[0],
+            headers={"Authorization": f"Bearer {token}", **_JSON_CONTENT_TYPE},
+        )
+        assert resp.status_code == 401
+
+    def test_register_jid_mismatch_returns_403(self, api_client: "httpx.Client") -> None:
         # Token is for alice but request body says bob
-        resp = client.post(
+        resp = api_client.post(
             "/api/v1/push/register",
             json={
                 "jid": "bob@example.com",
@@ -131,16 +175,15 @@ class TestPushApi:
         assert resp.status_code == 403
 
 
+# Deliberately not marked requires_backend: this is the API liveness check,
+# so an API outage fails it instead of skipping the whole module.
 @pytest.mark.skipif(not _HAS_HTTPX, reason="httpx not installed")
+@pytest.mark.xdist_group(name="server_info")
 class TestServerInfo:
     """Server discovery endpoint tests."""
 
-    @pytest.fixture()
-    def client(self) -> "httpx.Client":
-        return httpx.Client(base_url=API_BASE_URL, timeout=10)
-
-    def test_server_info_unauthenticated(self, client: "httpx.Client") -> None:
-        resp = client.get("/api/v1/server/info")
+    def test_server_info_unauthenticated(self, api_client: "httpx.Client") -> None:
+        resp = api_client.get("/api/v1/server/info")
         assert resp.status_code == 200
         data = resp.json()
         assert "xmpp_domain" in data
@@ -151,21 +194,20 @@ class TestServerInfo:
         assert "turn_server" in data
         assert "server_version" in data
         assert "min_client_version" in data
+        assert resp.headers["cache-control"] == "public, max-age=300"
 
 
 @pytest.mark.skipif(not _HAS_HTTPX, reason="httpx not installed")
+@pytest.mark.xdist_group(name="turn_credentials")
+@pytest.mark.requires_backend(*API_ADDRESS)
 class TestTurnCredentials:
     """TURN credential generation endpoint tests."""
 
-    @pytest.fixture()
-    def client(self) -> "httpx.Client":
-        return httpx.Client(base_url=API_BASE_URL, timeout=10)
-
     def _auth_header(self, jid: str = "alice@example.com") -> dict:
-        return {"Authorization": f"Bearer {_make_token(jid)}"}
+        return {"Authorization": f"Bearer {make_token(jid)}"}
 
-    def test_turn_credentials(self, client: "httpx.Client") -> None:
-        resp = client.get(
+    def test_turn_credentials(self, api_client: "httpx.Client") -> None:
+        resp = api_client.get(
             "/api/v1/turn/credentials",
             headers=self._auth_header(),
         )
@@ -179,6 +221,6 @@ class TestTurnCredentials:
         # Username should contain a timestamp and the user
         assert "alice" in data["username"]
 
-    def test_turn_credentials_requires_auth(self, client: "httpx.Client") -> None:
-        resp = client.get("/api/v1/turn/credentials")
+    def test_turn_credentials_requires_auth(self, api_client: "httpx.Client") -> None:
+        resp = api_client.get("/api/v1/turn/credentials")
         assert resp.status_code in (401, 403)
@@ -8,9 +8,8 @@ Tests verify:
 - Payload contains zero plaintext message content
 """
 
-import time
+import json
 
-import jwt
 import pytest
 
 try:
@@ -20,27 +19,23 @@ try:
 except ImportError:
     _HAS_HTTPX = False
 
-from conftest import API_BASE_URL
+from conftest import API_ADDRESS, make_token
 
-_JWT_SECRET = "test-jwt-secret"
+pytestmark = pytest.mark.requires_backend(*API_ADDRESS)
 
-
-def _make_token(jid: str, secret: str = _JWT_SECRET, exp_delta: int = 3600) -> str:
-    payload = {"sub": jid, "exp": int(time.time()) + exp_delta}
-    return jwt.encode(payload, secret, algorithm="HS256")
+_CLEANUP_BODY = json.dumps(
+    {"jid": "pushtest_callee@example.com", "device_id": "push-delivery-test-device"}
+).encode()
 
 
 @pytest.mark.skipif(not _HAS_HTTPX, reason="httpx not installed")
+@pytest.mark.xdist_group(name="call_notify")
 class TestCallNotify:
     """Call notification push delivery tests."""
 
-    @pytest.fixture()
-    def client(self) -> "httpx.Client":
-        return httpx.Client(base_url=API_BASE_URL, timeout=10)
-
-    def test_call_notify_no_registrations(self, client: "httpx.Client") -> None:
+    def test_call_notify_no_registrations(self, api_client: "httpx.Client") -> None:
         """Call-notify for an unregistered user returns no_registrations."""
-        resp = client.post(
+        resp = api_client.post(
             "/api/v1/push/call-notify",
             json={
                 "callee_username": "nobody_registered_12345",
@@ -55,9 +50,9 @@ class TestCallNotify:
         assert data["status"] == "no_registrations"
         assert data["sent"] == 0
 
-    def test_call_notify_no_auth_required(self, client: "httpx.Client") -> None:
+    def test_call_notify_no_auth_required(self, api_client: "httpx.Client") -> None:
         """Call-notify endpoint does NOT require JWT (internal Kamailio webhook)."""
-        resp = client.post(
+        resp = api_client.post(
             "/api/v1/push/call-notify",
             json={
                 "callee_username": "testuser",
@@ -70,14 +65,14 @@ class TestCallNotify:
         # Should not return 401/403 — endpoint is unauthenticated
         assert resp.status_code == 200
 
-    def test_call_notify_with_registered_device(self, client: "httpx.Client") -> None:
+    def test_call_notify_with_registered_device(self, api_client: "httpx.Client") -> None:
         """Register a push token then call-notify sends to that device."""
         test_jid = "pushtest_caller@example.com"
         test_callee_jid = "pushtest_callee@example.com"
 
         # Register a push token for the callee
-        headers = {"Authorization": f"Bearer {_make_token(test_callee_jid)}"}
-        reg_resp = client.post(
+        headers = {"Authorization": f"Bearer {make_token(test_callee_jid)}"}
+        reg_resp = api_client.post(
             "/api/v1/push/register",
             json={
                 "jid": test_callee_jid,
@@ -93,7 +88,7 @@ class TestCallNotify:
         # Now send a call-notify — should find the registration
         # (FCM will fail since we don't have real credentials, but the
         #  endpoint should still process the request without error)
-        resp = client.post(
+        resp = api_client.post(
             "/api/v1/push/call-notify",
             json={
                 "callee_username": "pushtest_callee",
@@ -109,19 +104,16 @@ class TestCallNotify:
         assert data["status"] in ("sent", "no_registrations")
 
         # Clean up
-        client.request(
+        api_client.request(
             "DELETE",
             "/api/v1/push/register",
-            json={
-                "jid": test_callee_jid,
-                "device_id": "push-delivery-test-device",
-            },
-            headers=headers,
+            content=_CLEANUP_BODY,
+            headers={**headers, "Content-Type": "application/json"},
         )
 
-    def test_call_notify_validates_call_type(self, client: "httpx.Client") -> None:
+    def test_call_notify_validates_call_type(self, api_client: "httpx.Client") -> None:
         """Call-notify rejects invalid call_type values."""
-        resp = client.post(
+        resp = api_client.post(
             "/api/v1/push/call-notify",
             json={
                 "callee_username": "bob",
@@ -133,9 +125,9 @@ class TestCallNotify:
         )
         assert resp.status_code == 422
 
-    def test_call_notify_missing_fields(self, client: "httpx.Client") -> None:
+    def test_call_notify_missing_fields(self, api_client: "httpx.Client") -> None:
         """Call-notify rejects requests with missing required fields."""
-        resp = client.post(
+        resp = api_client.post(
             "/api/v1/push/call-notify",
             json={
                 "callee_username": "bob",
@@ -144,9 +136,9 @@ class TestCallNotify:
         )
         assert resp.status_code == 422
 
-    def test_call_notify_video_call(self, client: "httpx.Client") -> None:
+    def test_call_notify_video_call(self, api_client: "httpx.Client") -> None:
         """Call-notify accepts video call type."""
-        resp = client.post(
+        resp = api_client.post(
             "/api/v1/push/call-notify",
             json={
                 "callee_username": "videotest",
@@ -9,103 +9,82 @@ Tests verify:
 
 import socket
 import ssl
+from typing import Iterator
 
 import pytest
 
-from conftest import SIP_HOST, SIP_PORT, XMPP_DOMAIN
+from conftest import SIP_HOST, SIP_PORT, XMPP_DOMAIN, read_sip_response
 
 SIP_WSS_PORT = 8089  # Host-mapped port for Kamailio WSS (container 8443)
 
-
+# Only depend on the configured host and domain, so encode them once.
+_OPTIONS_REQ = (
+    f"OPTIONS sip:{XMPP_DOMAIN} SIP/2.0\r\n"
+    f"Via: SIP/2.0/TLS {SIP_HOST}:5061;branch=z9hG4bK-test-call-001\r\n"
+    f"Max-Forwards: 70\r\n"
+    f"From: <sip:test@{XMPP_DOMAIN}>;tag=testcall001\r\n"
+    f"To: <sip:test@{XMPP_DOMAIN}>\r\n"
+    f"Call-ID: test-call-options-001@{SIP_HOST}\r\n"
+    f"CSeq: 1 OPTIONS\r\n"
+    f"Content-Length: 0\r\n"
+    f"\r\n"
+).encode()
+
+_UPGRADE_REQ = (
+    "GET / HTTP/1.1\r\n"
+    f"Host: {SIP_HOST}:{SIP_WSS_PORT}\r\n"
+    "Upgrade: websocket\r\n"
+    "Connection: Upgrade\r\n"
+    "Sec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\n"
+    "Sec-WebSocket-Version: 13\r\n"
+    "Sec-WebSocket-Protocol: sip\r\n"
+    "\r\n"
+).encode()
+
+
+@pytest.fixture(scope="module")
+def wss_tls_socket(tls_context: ssl.SSLContext) -> Iterator[ssl.SSLSocket]:
+    """One TLS connection to the WSS port shared by the WSS tests."""
+    raw_sock = socket.create_connection((SIP_HOST, SIP_WSS_PORT), timeout=5)
+    try:
+        tls_sock = tls_context.wrap_socket(raw_sock, server_hostname=SIP_HOST)
+    except ssl.SSLError:
+        raw_sock.close()
+        raise
+    with tls_sock:
+        yield tls_sock
+
+
+@pytest.mark.xdist_group(name="sip_tls")
 class TestSipTlsConnectivity:
     """Verify SIP server TLS connectivity on port 5061."""
 
-    def test_sip_tls_port_reachable(self) -> None:
+    def test_sip_tls_port_reachable(self, sip_tls_socket: ssl.SSLSocket) -> None:
         """Port 5061 accepts TLS connections."""
-        context = ssl.create_default_context()
-        context.check_hostname = False
-        context.verify_mode = ssl.CERT_NONE
-        raw_sock = socket.create_connection((SIP_HOST, SIP_PORT), timeout=5)
-        try:
-            tls_sock = context.wrap_socket(raw_sock, server_hostname=SIP_HOST)
-            tls_sock.close()
-        except ssl.SSLError:
-            raw_sock.close()
-            raise
+        assert sip_tls_socket.version() is not None
 
-    def test_sip_options_response(self) -> None:
+    @pytest.mark.requires_backend(SIP_HOST, SIP_PORT)
+    def test_sip_options_response(self, sip_tls_socket: ssl.SSLSocket) -> None:
         """Send SIP OPTIONS and expect a valid SIP/2.0 response."""
-        context = ssl.create_default_context()
-        context.check_hostname = False
-        context.verify_mode = ssl.CERT_NONE
-        raw_sock = socket.create_connection((SIP_HOST, SIP_PORT), timeout=5)
-        try:
-            tls_sock = context.wrap_socket(raw_sock, server_hostname=SIP_HOST)
-            try:
-                options_req = (
-                    f"OPTIONS sip:{XMPP_DOMAIN} SIP/2.0\r\n"
-                    f"Via: SIP/2.0/TLS {SIP_HOST}:5061;branch=z9hG4bK-test-call-001\r\n"
-                    f"Max-Forwards: 70\r\n"
-                    f"From: <sip:test@{XMPP_DOMAIN}>;tag=testcall001\r\n"
-                    f"To: <sip:test@{XMPP_DOMAIN}>\r\n"
-                    f"Call-ID: test-call-options-001@{SIP_HOST}\r\n"
-                    f"CSeq: 1 OPTIONS\r\n"
-                    f"Content-Length: 0\r\n"
-                    f"\r\n"
-                ).encode()
-                tls_sock.sendall(options_req)
-                data = tls_sock.recv(4096)
-                assert b"SIP/2.0" in data
-            finally:
-                tls_sock.close()
-        except ssl.SSLError:
-            raw_sock.close()
-            raise
+        sip_tls_socket.sendall(_OPTIONS_REQ)
+        data = read_sip_response(sip_tls_socket)
+        assert data.startswith(b"SIP/2.0")
 
 
+@pytest.mark.xdist_group(name="sip_wss")
 class TestSipWssConnectivity:
     """Verify WebSocket Secure connectivity on port 8443."""
 
-    def test_wss_port_reachable(self) -> None:
+    def test_wss_port_reachable(self, wss_tls_socket: ssl.SSLSocket) -> None:
         """WSS port accepts TLS connections."""
-        context = ssl.create_default_context()
-        context.check_hostname = False
-        context.verify_mode = ssl.CERT_NONE
-        raw_sock = socket.create_connection((SIP_HOST, SIP_WSS_PORT), timeout=5)
-        try:
-            tls_sock = context.wrap_socket(raw_sock, server_hostname=SIP_HOST)
-            tls_sock.close()
-        except ssl.SSLError:
-            raw_sock.close()
-            raise
+        assert wss_tls_socket.version() is not None
 
-    def test_websocket_upgrade(self) -> None:
+    @pytest.mark.requires_backend(SIP_HOST, SIP_WSS_PORT)
+    def test_websocket_upgrade(self, wss_tls_socket: ssl.SSLSocket) -> None:
         """WebSocket upgrade handshake on port 8443 returns 101 Switching Protocols."""
-        context = ssl.create_default_context()
-        context.check_hostname = False
-        context.verify_mode = ssl.CERT_NONE
-        raw_sock = socket.create_connection((SIP_HOST, SIP_WSS_PORT), timeout=5)
-        try:
-            tls_sock = context.wrap_socket(raw_sock, server_hostname=SIP_HOST)
-            try:
-                upgrade_req = (
-                    "GET / HTTP/1.1\r\n"
-                    f"Host: {SIP_HOST}:{SIP_WSS_PORT}\r\n"
-                    "Upgrade: websocket\r\n"
-                    "Connection: Upgrade\r\n"
-                    "Sec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\n"
-                    "Sec-WebSocket-Version: 13\r\n"
-                    "Sec-WebSocket-Protocol: sip\r\n"
-                    "\r\n"
-                ).encode()
-                tls_sock.sendall(upgrade_req)
-                data = tls_sock.recv(4096)
-                assert b"101" in data or b"HTTP/1.1" in data
-            finally:
-                tls_sock.close()
-        except ssl.SSLError:
-            raw_sock.close()
-            raise
+        wss_tls_socket.sendall(_UPGRADE_REQ)
+        data = wss_tls_socket.recv(4096)
+        assert b"101" in data or b"HTTP/1.1" in data
 
 
 class TestRtpEngineConnectivity:
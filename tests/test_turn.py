@@ -12,6 +12,9 @@ import pytest
 
 from conftest import TURN_HOST, TURN_PORT
 
+# STUN header: message type, message length, magic cookie (RFC 5389 §6).
+_STUN_HEADER = struct.Struct("!HHI")
+
 
 def _build_stun_binding_request() -> bytes:
     """Build a minimal STUN Binding Request (RFC 5389).
@@ -27,44 +30,50 @@ def _build_stun_binding_request() -> bytes:
     magic_cookie = 0x2112A442
     # Deterministic transaction ID for testing
     transaction_id = b"\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c"
-    return struct.pack(
-        "!HHI", msg_type, msg_length, magic_cookie
-    ) + transaction_id
+    return _STUN_HEADER.pack(msg_type, msg_length, magic_cookie) + transaction_id
+
+
+# The request is fully deterministic, so build it once for every test.
+_STUN_REQ = _build_stun_binding_request()
 
 
+@pytest.fixture(scope="module")
+def stun_response() -> bytes:
+    """Send one STUN Binding Request and return the server's reply.
+
+    Both tests check the same exchange, so it only happens once.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.settimeout(5)
+    try:
+        sock.sendto(_STUN_REQ, (TURN_HOST, TURN_PORT))
+        data, _ = sock.recvfrom(1024)
+        return data
+    finally:
+        sock.close()
+
+
+@pytest.mark.xdist_group(name="stun")
 class TestTurnConnectivity:
     """Verify STUN/TURN server is reachable and responds."""
 
-    def test_stun_binding_request(self) -> None:
-        """Send a STUN Binding Request and verify a Binding Success Response."""
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.settimeout(5)
-        try:
-            request = _build_stun_binding_request()
-            sock.sendto(request, (TURN_HOST, TURN_PORT))
-            data, _ = sock.recvfrom(1024)
-
-            # Verify STUN response header
-            assert len(data) >= 20, "STUN response too short"
-
-            msg_type, msg_length, magic_cookie = struct.unpack("!HHI", data[:8])
-            # 0x0101 = Binding Success Response
-            assert msg_type == 0x0101, f"Expected Binding Success (0x0101), got 0x{msg_type:04x}"
-            assert magic_cookie == 0x2112A442, "Invalid magic cookie"
-
-            # Transaction ID should match
-            assert data[8:20] == b"\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c"
-        finally:
-            sock.close()
-
-    def test_stun_udp_port_reachable(self) -> None:
+    # coturn also listens on TCP 3478, which makes a cheap liveness probe.
+    @pytest.mark.requires_backend(TURN_HOST, TURN_PORT)
+    def test_stun_binding_request(self, stun_response: bytes) -> None:
+        """Verify the Binding Request gets a Binding Success Response."""
+        data = stun_response
+
+        # Verify STUN response header
+        assert len(data) >= 20, "STUN response too short"
+
+        msg_type, msg_length, magic_cookie = _STUN_HEADER.unpack_from(data)
+        # 0x0101 = Binding Success Response
+        assert msg_type == 0x0101, f"Expected Binding Success (0x0101), got 0x{msg_type:04x}"
+        assert magic_cookie == 0x2112A442, "Invalid magic cookie"
+
+        # Transaction ID should match
+        assert data[8:20] == b"\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c"
+
+    def test_stun_udp_port_reachable(self, stun_response: bytes) -> None:
         """Port 3478/UDP is open and responds."""
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.settimeout(5)
-        try:
-            request = _build_stun_binding_request()
-            sock.sendto(request, (TURN_HOST, TURN_PORT))
-            data, addr = sock.recvfrom(1024)
-            assert len(data) > 0, "No response from STUN server"
-        finally:
-            sock.close()
+        assert len(stun_response) > 0, "No response from STUN server"
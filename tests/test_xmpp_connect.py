@@ -11,39 +11,46 @@ import ssl
 
 import pytest
 
-from conftest import XMPP_HOST, XMPP_PORT_STARTTLS, XMPP_PORT_TLS, XMPP_DOMAIN
+from conftest import (
+    XMPP_DOMAIN,
+    XMPP_HOST,
+    XMPP_PORT_STARTTLS,
+    XMPP_PORT_TLS,
+    XMPP_STREAM_HEADER,
+    read_stream_features,
+)
 
 
+@pytest.fixture(scope="module")
+def starttls_stream_open() -> bytes:
+    """Everything port 5222 sends up to the end of its stream features.
+
+    Both STARTTLS-port tests assert on this one exchange instead of each
+    opening its own connection.
+    """
+    with socket.create_connection((XMPP_HOST, XMPP_PORT_STARTTLS), timeout=5) as sock:
+        sock.sendall(XMPP_STREAM_HEADER)
+        return read_stream_features(sock)
+
+
+@pytest.mark.xdist_group(name="xmpp")
 class TestXmppConnectivity:
     """Verify basic XMPP server connectivity."""
 
-    def test_starttls_port_reachable(self) -> None:
+    def test_starttls_port_reachable(self, starttls_stream_open: bytes) -> None:
         """Port 5222 accepts TCP connections."""
-        sock = socket.create_connection((XMPP_HOST, XMPP_PORT_STARTTLS), timeout=5)
-        try:
-            data = sock.recv(4096)
-            # Ejabberd sends an XML stream header on connect
-            assert b"<?xml" in data or b"<stream:" in data or b"stream:stream" in data
-        finally:
-            sock.close()
+        # Ejabberd answers the stream header with its own
+        data = starttls_stream_open
+        assert b"<?xml" in data or b"<stream:" in data or b"stream:stream" in data
 
-    def test_direct_tls_port_reachable(self) -> None:
+    def test_direct_tls_port_reachable(self, tls_context: ssl.SSLContext) -> None:
         """Port 5223 accepts TLS connections."""
-        context = ssl.create_default_context()
-        context.check_hostname = False
-        context.verify_mode = ssl.CERT_NONE
         sock = socket.create_connection((XMPP_HOST, XMPP_PORT_TLS), timeout=5)
         try:
-            tls_sock = context.wrap_socket(sock, server_hostname=XMPP_DOMAIN)
+            tls_sock = tls_context.wrap_socket(sock, server_hostname=XMPP_DOMAIN)
             try:
                 # After TLS handshake, send stream header and expect XML response
-                stream_header = (
-                    f"<?xml version='1.0'?>"
-                    f"<stream:stream xmlns='jabber:client' "
-                    f"xmlns:stream='http://etherx.jabber.org/streams' "
-                    f"to='{XMPP_DOMAIN}' version='1.0'>"
-                ).encode()
-                tls_sock.sendall(stream_header)
+                tls_sock.sendall(XMPP_STREAM_HEADER)
                 data = tls_sock.recv(4096)
                 assert b"stream:stream" in data or b"stream:features" in data
             finally:
@@ -52,24 +59,7 @@ class TestXmppConnectivity:
             sock.close()
             raise
 
-    def test_starttls_offered(self) -> None:
+    @pytest.mark.requires_backend(XMPP_HOST, XMPP_PORT_STARTTLS)
+    def test_starttls_offered(self, starttls_stream_open: bytes) -> None:
         """Port 5222 offers STARTTLS in stream features."""
-        sock = socket.create_connection((XMPP_HOST, XMPP_PORT_STARTTLS), timeout=5)
-        try:
-            stream_header = (
-                f"<?xml version='1.0'?>"
-                f"<stream:stream xmlns='jabber:client' "
-                f"xmlns:stream='http://etherx.jabber.org/streams' "
-                f"to='{XMPP_DOMAIN}' version='1.0'>"
-            ).encode()
-            sock.sendall(stream_header)
-            data = b""
-            # Read until we see features or timeout
-            while b"</stream:features>" not in data:
-                chunk = sock.recv(4096)
-                if not chunk:
-                    break
-                data += chunk
-            assert b"starttls" in data.lower()
-        finally:
-            sock.close()
+        assert b"starttls" in starttls_stream_open.lower()